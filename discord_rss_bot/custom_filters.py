@@ -11,7 +11,7 @@ from discord_rss_bot.settings import get_reader
 reader: Reader = get_reader()
 
 
-@lru_cache
+@lru_cache(maxsize=4096)
 def encode_url(url_to_quote: str) -> str:
     """%-escape the URL so it can be used in a URL.
 
@@ -27,6 +27,41 @@ def encode_url(url_to_quote: str) -> str:
     return urllib.parse.quote(url_to_quote) if url_to_quote else ""
 
 
+@lru_cache(maxsize=1024)
+def feed_has_white_tags(feed_url: str) -> bool:
+    """Check if the feed has whitelist tags, this is cached by feed URL so it is only checked once per feed.
+
+    Args:
+        feed_url: The URL of the feed to check.
+
+    Returns:
+        bool: True if the feed has any whitelist tags, False otherwise.
+    """
+    return has_white_tags(reader, feed_url)  # type: ignore
+
+
+@lru_cache(maxsize=1024)
+def feed_has_black_tags(feed_url: str) -> bool:
+    """Check if the feed has blacklist tags, this is cached by feed URL so it is only checked once per feed.
+
+    Args:
+        feed_url: The URL of the feed to check.
+
+    Returns:
+        bool: True if the feed has any blacklist tags, False otherwise.
+    """
+    return has_black_tags(reader, feed_url)  # type: ignore
+
+
+def invalidate_filter_cache() -> None:
+    """Forget if the feeds have whitelist or blacklist tags.
+
+    This has to be called every time the whitelist or blacklist tags are changed or a feed is removed.
+    """
+    feed_has_white_tags.cache_clear()
+    feed_has_black_tags.cache_clear()
+
+
 def entry_is_whitelisted(entry_to_check: Entry) -> bool:
     """Check if the entry is whitelisted.
 
@@ -37,7 +72,7 @@ def entry_is_whitelisted(entry_to_check: Entry) -> bool:
         bool: True if the feed is whitelisted, False otherwise.
 
     """
-    return bool(has_white_tags(reader, entry_to_check.feed) and should_be_sent(reader, entry_to_check))
+    return bool(feed_has_white_tags(entry_to_check.feed.url) and should_be_sent(reader, entry_to_check))
 
 
 def entry_is_blacklisted(entry_to_check: Entry) -> bool:
@@ -50,4 +85,4 @@ def entry_is_blacklisted(entry_to_check: Entry) -> bool:
         bool: True if the feed is blacklisted, False otherwise.
 
     """
-    return bool(has_black_tags(reader, entry_to_check.feed) and should_be_skipped(reader, entry_to_check))
+    return bool(feed_has_black_tags(entry_to_check.feed.url) and should_be_skipped(reader, entry_to_check))
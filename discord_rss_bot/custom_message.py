@@ -1,14 +1,23 @@
-import json
+import re
 from dataclasses import dataclass
+from functools import lru_cache
+from typing import Any
 
-from bs4 import BeautifulSoup
+import orjson
+from bs4 import BeautifulSoup, SoupStrainer
 from reader import Entry, Feed, Reader, TagNotFoundError
 
 from discord_rss_bot.markdown import convert_html_to_md
 from discord_rss_bot.settings import get_reader
 
+# We only care about <img> tags when looking for images, so don't build the rest of the tree.
+only_images: SoupStrainer = SoupStrainer("img")
 
-@dataclass()
+# Matches a tag like {{entry_title}} or a literal \n, this is used to replace every tag in a single pass.
+tag_pattern: re.Pattern[str] = re.compile(r"{{\w+}}|\\n")
+
+
+@dataclass(slots=True)
 class CustomEmbed:
     title: str
     description: str
@@ -22,22 +31,112 @@ class CustomEmbed:
     footer_icon_url: str
 
 
-def try_to_replace(custom_message: str, template: str, replace_with: str) -> str:
-    """Try to replace a tag in custom_message.
+# The fields in the embed tag and what they default to if they are missing.
+embed_defaults: dict[str, str] = {
+    "title": "",
+    "description": "",
+    "color": "",
+    "author_name": "",
+    "author_url": "",
+    "author_icon_url": "",
+    "image_url": "",
+    "thumbnail_url": "",
+    "footer_text": "",
+    "footer_icon_url": "",
+}
+
+
+def try_to_replace(custom_message: str, replacements: dict[str, str]) -> str:
+    """Try to replace the tags in custom_message.
+
+    Every tag is replaced in a single pass over custom_message. Tags that aren't in replacements are left as they are.
 
     Args:
         custom_message: The custom_message to replace tags in.
-        template: The tag to replace.
-        replace_with: What to replace the tag with.
+        replacements: The tags to replace and what to replace them with.
 
     Returns:
-        Returns the custom_message with the tag replaced.
+        Returns the custom_message with the tags replaced.
     """
-    try:
-        return custom_message.replace(template, replace_with)
-    except (TypeError, AttributeError, ValueError):
+    if not isinstance(custom_message, str):
         return custom_message
 
+    return tag_pattern.sub(lambda match: replacements.get(match.group(0), match.group(0)), custom_message)
+
+
+def get_used_tags(*messages: str) -> set[str]:
+    """Get the tags that are used in messages.
+
+    Args:
+        messages: The messages to look for tags in. Anything that isn't a string is ignored.
+
+    Returns:
+        Returns the tags, for example {"{{entry_title}}", "{{entry_link}}"}.
+    """
+    return {tag for message in messages if isinstance(message, str) for tag in tag_pattern.findall(message)}
+
+
+def get_replacements(feed: Feed, entry: Entry, used_tags: set[str]) -> dict[str, str]:
+    """Get what every tag should be replaced with for an entry.
+
+    Args:
+        feed: The feed to get the tags from.
+        entry: The entry to get the tags from.
+        used_tags: The tags that are used, this is used to skip the slow tags that aren't needed.
+
+    Returns:
+        Returns the tags and what to replace them with.
+    """
+    summary: str = entry.summary or ""
+    raw_content: str = entry.content[0].value if entry.content else ""
+
+    # Converting to Markdown and looking for images is slow, so only do it if the tag is used.
+    first_image: str = get_first_image(summary, raw_content) if "{{image_1}}" in used_tags else ""
+
+    content: str = ""
+    if "{{entry_content}}" in used_tags or "{{entry_text}}" in used_tags:
+        content = convert_html_to_md(raw_content)
+
+    # {{entry_text}} only uses the summary if there is no content.
+    if "{{entry_summary}}" in used_tags or ("{{entry_text}}" in used_tags and not content):
+        summary = convert_html_to_md(summary)
+    else:
+        summary = ""
+
+    all_replacements: dict[str, Any] = {
+        "{{feed_author}}": feed.author,
+        "{{feed_added}}": feed.added,
+        "{{feed_last_exception}}": feed.last_exception,
+        "{{feed_last_updated}}": feed.last_updated,
+        "{{feed_link}}": feed.link,
+        "{{feed_subtitle}}": feed.subtitle,
+        "{{feed_title}}": feed.title,
+        "{{feed_updated}}": feed.updated,
+        "{{feed_updates_enabled}}": feed.updates_enabled,
+        "{{feed_url}}": feed.url,
+        "{{feed_user_title}}": feed.user_title,
+        "{{feed_version}}": feed.version,
+        "{{entry_added}}": entry.added,
+        "{{entry_author}}": entry.author,
+        "{{entry_content}}": content,
+        "{{entry_content_raw}}": raw_content,
+        "{{entry_id}}": entry.id,
+        "{{entry_important}}": entry.important,
+        "{{entry_link}}": entry.link,
+        "{{entry_published}}": entry.published,
+        "{{entry_read}}": entry.read,
+        "{{entry_read_modified}}": entry.read_modified,
+        "{{entry_summary}}": summary,
+        "{{entry_summary_raw}}": entry.summary or "",
+        "{{entry_text}}": content or summary,
+        "{{entry_title}}": entry.title,
+        "{{entry_updated}}": entry.updated,
+        "{{image_1}}": first_image,
+    }
+
+    # Tags without a value are left as they are, everything else is replaced with it as a string.
+    return {tag: str(value) for tag, value in all_replacements.items() if value is not None}
+
 
 def replace_tags_in_text_message(entry: Entry) -> str:
     """Replace tags in custom_message.
@@ -51,55 +150,14 @@ def replace_tags_in_text_message(entry: Entry) -> str:
     feed: Feed = entry.feed
     custom_reader: Reader = get_reader()
     custom_message: str = get_custom_message(feed=feed, custom_reader=custom_reader)
+    used_tags: set[str] = get_used_tags(custom_message)
 
-    content = ""
-    if entry.content:
-        for content_item in entry.content:
-            content: str = content_item.value
+    replacements: dict[str, str] = get_replacements(feed, entry, used_tags)
 
-    summary: str = entry.summary or ""
+    # Text messages can use \n to add a newline.
+    replacements["\\n"] = "\n"
 
-    first_image = get_first_image(summary, content)
-
-    summary = convert_html_to_md(summary)
-    content = convert_html_to_md(content)
-
-    list_of_replacements = [
-        {"{{feed_author}}": feed.author},
-        {"{{feed_added}}": feed.added},
-        {"{{feed_last_exception}}": feed.last_exception},
-        {"{{feed_last_updated}}": feed.last_updated},
-        {"{{feed_link}}": feed.link},
-        {"{{feed_subtitle}}": feed.subtitle},
-        {"{{feed_title}}": feed.title},
-        {"{{feed_updated}}": feed.updated},
-        {"{{feed_updates_enabled}}": str(feed.updates_enabled)},
-        {"{{feed_url}}": feed.url},
-        {"{{feed_user_title}}": feed.user_title},
-        {"{{feed_version}}": feed.version},
-        {"{{entry_added}}": entry.added},
-        {"{{entry_author}}": entry.author},
-        {"{{entry_content}}": content},
-        {"{{entry_content_raw}}": entry.content[0].value if entry.content else ""},
-        {"{{entry_id}}": entry.id},
-        {"{{entry_important}}": str(entry.important)},
-        {"{{entry_link}}": entry.link},
-        {"{{entry_published}}": entry.published},
-        {"{{entry_read}}": str(entry.read)},
-        {"{{entry_read_modified}}": entry.read_modified},
-        {"{{entry_summary}}": summary},
-        {"{{entry_summary_raw}}": entry.summary or ""},
-        {"{{entry_text}}": content or summary},
-        {"{{entry_title}}": entry.title},
-        {"{{entry_updated}}": entry.updated},
-        {"{{image_1}}": first_image},
-    ]
-
-    for replacement in list_of_replacements:
-        for template, replace_with in replacement.items():
-            custom_message = try_to_replace(custom_message, template, replace_with)
-
-    return custom_message.replace("\\n", "\n")
+    return try_to_replace(custom_message, replacements)
 
 
 def get_first_image(summary, content):
@@ -112,10 +170,10 @@ def get_first_image(summary, content):
     Returns:
         The first image
     """
-    if content and (images := BeautifulSoup(content, features="lxml").find_all("img")):
-        return images[0].attrs["src"]
-    if summary and (images := BeautifulSoup(summary, features="lxml").find_all("img")):
-        return images[0].attrs["src"]
+    # Stop at the first image we find, so the summary is only parsed if the content has no images.
+    for html in (content, summary):
+        if html and (image := BeautifulSoup(html, features="lxml", parse_only=only_images).find("img")) is not None:
+            return image.attrs["src"]
     return ""
 
 
@@ -131,63 +189,29 @@ def replace_tags_in_embed(feed: Feed, entry: Entry) -> CustomEmbed:
     """
     custom_reader: Reader = get_reader()
     embed: CustomEmbed = get_embed(feed=feed, custom_reader=custom_reader)
+    used_tags: set[str] = get_used_tags(
+        embed.title,
+        embed.description,
+        embed.author_name,
+        embed.author_url,
+        embed.author_icon_url,
+        embed.image_url,
+        embed.thumbnail_url,
+        embed.footer_text,
+        embed.footer_icon_url,
+    )
 
-    content = ""
-    if entry.content:
-        for content_item in entry.content:
-            content: str = content_item.value
-
-    summary: str = entry.summary or ""
+    replacements: dict[str, str] = get_replacements(feed, entry, used_tags)
 
-    first_image = get_first_image(summary, content)
-
-    summary = convert_html_to_md(summary)
-    content = convert_html_to_md(content)
-
-    entry_text: str = content or summary
-
-    list_of_replacements = [
-        {"{{feed_author}}": feed.author},
-        {"{{feed_added}}": feed.added},
-        {"{{feed_last_exception}}": feed.last_exception},
-        {"{{feed_last_updated}}": feed.last_updated},
-        {"{{feed_link}}": feed.link},
-        {"{{feed_subtitle}}": feed.subtitle},
-        {"{{feed_title}}": feed.title},
-        {"{{feed_updated}}": feed.updated},
-        {"{{feed_updates_enabled}}": str(feed.updates_enabled)},
-        {"{{feed_url}}": feed.url},
-        {"{{feed_user_title}}": feed.user_title},
-        {"{{feed_version}}": feed.version},
-        {"{{entry_added}}": entry.added},
-        {"{{entry_author}}": entry.author},
-        {"{{entry_content}}": content},
-        {"{{entry_content_raw}}": entry.content[0].value if entry.content else ""},
-        {"{{entry_id}}": entry.id},
-        {"{{entry_important}}": str(entry.important)},
-        {"{{entry_link}}": entry.link},
-        {"{{entry_published}}": entry.published},
-        {"{{entry_read}}": str(entry.read)},
-        {"{{entry_read_modified}}": entry.read_modified},
-        {"{{entry_summary}}": summary},
-        {"{{entry_summary_raw}}": entry.summary or ""},
-        {"{{entry_title}}": entry.title},
-        {"{{entry_text}}": entry_text},
-        {"{{entry_updated}}": entry.updated},
-        {"{{image_1}}": first_image},
-    ]
-
-    for replacement in list_of_replacements:
-        for template, replace_with in replacement.items():
-            embed.title = try_to_replace(embed.title, template, replace_with)
-            embed.description = try_to_replace(embed.description, template, replace_with)
-            embed.author_name = try_to_replace(embed.author_name, template, replace_with)
-            embed.author_url = try_to_replace(embed.author_url, template, replace_with)
-            embed.author_icon_url = try_to_replace(embed.author_icon_url, template, replace_with)
-            embed.image_url = try_to_replace(embed.image_url, template, replace_with)
-            embed.thumbnail_url = try_to_replace(embed.thumbnail_url, template, replace_with)
-            embed.footer_text = try_to_replace(embed.footer_text, template, replace_with)
-            embed.footer_icon_url = try_to_replace(embed.footer_icon_url, template, replace_with)
+    embed.title = try_to_replace(embed.title, replacements)
+    embed.description = try_to_replace(embed.description, replacements)
+    embed.author_name = try_to_replace(embed.author_name, replacements)
+    embed.author_url = try_to_replace(embed.author_url, replacements)
+    embed.author_icon_url = try_to_replace(embed.author_icon_url, replacements)
+    embed.image_url = try_to_replace(embed.image_url, replacements)
+    embed.thumbnail_url = try_to_replace(embed.thumbnail_url, replacements)
+    embed.footer_text = try_to_replace(embed.footer_text, replacements)
+    embed.footer_icon_url = try_to_replace(embed.footer_icon_url, replacements)
 
     return embed
 
@@ -195,15 +219,31 @@ def replace_tags_in_embed(feed: Feed, entry: Entry) -> CustomEmbed:
 def get_custom_message(custom_reader: Reader, feed: Feed) -> str:
     """Get custom_message tag from feed.
 
+    The tag is cached per feed, call invalidate_feed_cache() after changing it.
+
     Args:
         custom_reader: What Reader to use.
         feed: The feed to get the tag from.
 
+    Returns:
+        Returns the contents from the custom_message tag.
+    """
+    return get_cached_custom_message(custom_reader, feed.url)
+
+
+@lru_cache(maxsize=512)
+def get_cached_custom_message(custom_reader: Reader, feed_url: str) -> str:
+    """Get custom_message tag from feed, this is cached by feed URL because Feed changes every update.
+
+    Args:
+        custom_reader: What Reader to use.
+        feed_url: The URL of the feed to get the tag from.
+
     Returns:
         Returns the contents from the custom_message tag.
     """
     try:
-        custom_message: str = str(custom_reader.get_tag(feed, "custom_message"))
+        custom_message: str = str(custom_reader.get_tag(feed_url, "custom_message"))
     except TagNotFoundError:
         custom_message = ""
     except ValueError:
@@ -212,6 +252,15 @@ def get_custom_message(custom_reader: Reader, feed: Feed) -> str:
     return custom_message
 
 
+def invalidate_feed_cache() -> None:
+    """Forget the cached custom_message and embed tags.
+
+    This has to be called every time the custom_message or embed tag is changed or the feed is removed.
+    """
+    get_cached_custom_message.cache_clear()
+    get_cached_embed_data.cache_clear()
+
+
 def save_embed(custom_reader: Reader, feed: Feed, embed: CustomEmbed) -> None:
     """Set embed tag in feed.
 
@@ -233,7 +282,8 @@ def save_embed(custom_reader: Reader, feed: Feed, embed: CustomEmbed) -> None:
         "footer_icon_url": embed.footer_icon_url,
     }
 
-    custom_reader.set_tag(feed, "embed", json.dumps(embed_dict))  # type: ignore
+    custom_reader.set_tag(feed, "embed", orjson.dumps(embed_dict).decode())  # type: ignore
+    invalidate_feed_cache()
 
 
 def get_embed(custom_reader: Reader, feed: Feed) -> CustomEmbed:
@@ -246,10 +296,7 @@ def get_embed(custom_reader: Reader, feed: Feed) -> CustomEmbed:
     Returns:
         Returns the contents from the embed tag.
     """
-    if embed := custom_reader.get_tag(feed, "embed", ""):
-        if type(embed) != str:
-            return get_embed_data(embed)
-        embed_data: dict[str, str | int] = json.loads(embed)
+    if embed_data := get_cached_embed_data(custom_reader, feed.url):
         return get_embed_data(embed_data)
 
     return CustomEmbed(
@@ -266,6 +313,25 @@ def get_embed(custom_reader: Reader, feed: Feed) -> CustomEmbed:
     )
 
 
+@lru_cache(maxsize=512)
+def get_cached_embed_data(custom_reader: Reader, feed_url: str) -> dict[str, str | int] | None:
+    """Get the decoded embed tag from feed, this is cached by feed URL so we only decode the JSON once.
+
+    Args:
+        custom_reader: What Reader to use.
+        feed_url: The URL of the feed to get the tag from.
+
+    Returns:
+        Returns the embed data, or None if the feed has no embed.
+    """
+    embed = custom_reader.get_tag(feed_url, "embed", "")
+    if isinstance(embed, str):
+        # The embed is saved as a JSON string by save_embed, but add_missing_tags saves it as a dict.
+        embed = orjson.loads(embed) if embed else None
+
+    return embed  # type: ignore
+
+
 def get_embed_data(embed_data) -> CustomEmbed:
     """Get embed data from embed_data.
 
@@ -275,26 +341,4 @@ def get_embed_data(embed_data) -> CustomEmbed:
     Returns:
         Returns the embed data.
     """
-    title: str = embed_data.get("title", "")
-    description: str = embed_data.get("description", "")
-    color: str = embed_data.get("color", "")
-    author_name: str = embed_data.get("author_name", "")
-    author_url: str = embed_data.get("author_url", "")
-    author_icon_url: str = embed_data.get("author_icon_url", "")
-    image_url: str = embed_data.get("image_url", "")
-    thumbnail_url: str = embed_data.get("thumbnail_url", "")
-    footer_text: str = embed_data.get("footer_text", "")
-    footer_icon_url: str = embed_data.get("footer_icon_url", "")
-
-    return CustomEmbed(
-        title=title,
-        description=description,
-        color=color,
-        author_name=author_name,
-        author_url=author_url,
-        author_icon_url=author_icon_url,
-        image_url=image_url,
-        thumbnail_url=thumbnail_url,
-        footer_text=footer_text,
-        footer_icon_url=footer_icon_url,
-    )
+    return CustomEmbed(**{field: embed_data.get(field, default) for field, default in embed_defaults.items()})
@@ -1,13 +1,18 @@
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import suppress
 from typing import TYPE_CHECKING
 
 from discord_webhook import DiscordEmbed, DiscordWebhook
 from fastapi import HTTPException
-from reader import Entry, Feed, FeedExistsError, Reader, TagNotFoundError
+from reader import Entry, Feed, FeedExistsError, Reader
+from requests import RequestException
 
 from discord_rss_bot import custom_message
 from discord_rss_bot.filter.blacklist import should_be_skipped
 from discord_rss_bot.filter.whitelist import has_white_tags, should_be_sent
 from discord_rss_bot.settings import default_custom_message, get_reader
+from discord_rss_bot.webhook import list_webhooks
 
 if TYPE_CHECKING:
     from collections.abc import Iterable
@@ -72,7 +77,7 @@ def create_embed_webhook(webhook_url: str, entry: Entry) -> DiscordWebhook:
         discord_embed.set_title(custom_embed.title)
     if custom_embed.description:
         discord_embed.set_description(custom_embed.description)
-    if custom_embed.color and type(custom_embed.color) == str and custom_embed.color.startswith("#"):
+    if custom_embed.color and isinstance(custom_embed.color, str) and custom_embed.color.startswith("#"):
         custom_embed.color = custom_embed.color[1:]
         discord_embed.set_color(int(custom_embed.color, 16))
     if custom_embed.author_name and not custom_embed.author_url and not custom_embed.author_icon_url:
@@ -103,6 +108,27 @@ def create_embed_webhook(webhook_url: str, entry: Entry) -> DiscordWebhook:
     return webhook
 
 
+def create_text_webhook(reader: Reader, webhook_url: str, entry: Entry) -> DiscordWebhook:
+    """Create a webhook with a text message.
+
+    Args:
+        reader: The reader to get the custom message from.
+        webhook_url: The webhook URL.
+        entry: The entry to send to Discord.
+
+    Returns:
+        DiscordWebhook: The webhook with the message.
+    """
+    # If the user has set the custom message to an empty string, we will use the default message, otherwise we
+    # will use the custom message.
+    if custom_message.get_custom_message(reader, entry.feed) != "":
+        webhook_message = custom_message.replace_tags_in_text_message(entry)
+    else:
+        webhook_message: str = default_custom_message
+
+    return DiscordWebhook(url=webhook_url, content=webhook_message, rate_limit_retry=True)
+
+
 def send_to_discord(custom_reader: Reader | None = None, feed: Feed | None = None, do_once: bool = False) -> None:
     """Send entries to Discord.
 
@@ -122,6 +148,12 @@ def send_to_discord(custom_reader: Reader | None = None, feed: Feed | None = Non
     # Check for new entries for every feed.
     reader.update_feeds()
 
+    # The webhook URL for each feed, so we don't have to get it for every entry.
+    webhook_urls: dict[str, str] = {}
+
+    # The webhooks we should send, grouped by webhook URL.
+    webhooks_to_send: defaultdict[str, list[tuple[Entry, DiscordWebhook]]] = defaultdict(list)
+
     # Loop through the unread entries.
     entries: Iterable[Entry] = reader.get_entries(feed=feed, read=False)
     for entry in entries:
@@ -129,52 +161,74 @@ def send_to_discord(custom_reader: Reader | None = None, feed: Feed | None = Non
         reader.set_entry_read(entry, True)
 
         # Get the webhook URL for the entry. If it is None, we will continue to the next entry.
-        webhook_url: str = str(reader.get_tag(entry.feed_url, "webhook", ""))
+        # Every entry from a feed uses the same webhook, so we only get it from the database once per feed.
+        if entry.feed_url not in webhook_urls:
+            webhook_urls[entry.feed_url] = str(reader.get_tag(entry.feed_url, "webhook", ""))
+        webhook_url: str = webhook_urls[entry.feed_url]
         if not webhook_url:
             continue
 
         if bool(reader.get_tag(entry.feed, "should_send_embed")):
             webhook = create_embed_webhook(webhook_url, entry)
         else:
-            # If the user has set the custom message to an empty string, we will use the default message, otherwise we
-            # will use the custom message.
-            if custom_message.get_custom_message(reader, entry.feed) != "":
-                webhook_message = custom_message.replace_tags_in_text_message(entry)
-            else:
-                webhook_message: str = default_custom_message
-
-            # Create the webhook.
-            webhook: DiscordWebhook = DiscordWebhook(url=webhook_url, content=webhook_message, rate_limit_retry=True)
+            webhook: DiscordWebhook = create_text_webhook(reader, webhook_url, entry)
 
         # Check if the feed has a whitelist, and if it does, check if the entry is whitelisted.
+        # The entry is already marked as read, so entries that aren't sent don't have to be marked again.
         if has_white_tags(reader, entry.feed):
             if should_be_sent(reader, entry):
-                response: Response = webhook.execute()
-                reader.set_entry_read(entry, True)
-                if not response.ok:
-                    reader.set_entry_read(entry, False)
-            else:
-                reader.set_entry_read(entry, True)
+                webhooks_to_send[webhook_url].append((entry, webhook))
             continue
 
-        # Check if the entry is blacklisted, if it is, mark it as read and continue.
+        # Check if the entry is blacklisted, if it is, skip it.
         if should_be_skipped(reader, entry):
-            reader.set_entry_read(entry, True)
             continue
 
         # It was not blacklisted, and not forced through whitelist, so we will send it to Discord.
-        response: Response = webhook.execute()
-        if not response.ok:
-            reader.set_entry_read(entry, False)
+        webhooks_to_send[webhook_url].append((entry, webhook))
 
         # If we only want to send one entry, we will break the loop. This is used when testing this function.
         if do_once:
             break
 
+    # Send to the different webhooks at the same time. Entries for the same webhook are sent one at a time and in
+    # order, so we don't run into Discord's rate limits.
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        failed_entries: Iterable[list[Entry]] = executor.map(send_webhooks, webhooks_to_send.values())
+
+    # Mark the entries that failed as unread, so they will be sent again next time.
+    for entries_for_webhook in failed_entries:
+        for entry in entries_for_webhook:
+            reader.set_entry_read(entry, False)
+
     # Update the search index.
     reader.update_search()
 
 
+def send_webhooks(webhooks: list[tuple[Entry, DiscordWebhook]]) -> list[Entry]:
+    """Send webhooks to Discord, one after another.
+
+    Args:
+        webhooks: The entries and the webhooks to send for them.
+
+    Returns:
+        list[Entry]: The entries that could not be sent.
+    """
+    failed_entries: list[Entry] = []
+    for entry, webhook in webhooks:
+        # Keep sending the rest of the entries if one of them fails, they are already marked as read.
+        try:
+            response: Response = webhook.execute()
+        except RequestException:
+            failed_entries.append(entry)
+            continue
+
+        if not response.ok:
+            failed_entries.append(entry)
+
+    return failed_entries
+
+
 def create_feed(reader: Reader, feed_url: str, webhook_dropdown: str) -> None:
     """Add a new feed, update it and mark every entry as read.
 
@@ -187,27 +241,19 @@ def create_feed(reader: Reader, feed_url: str, webhook_dropdown: str) -> None:
         HTTPException: If webhook_dropdown does not equal a webhook or default_custom_message not found.
     """
     clean_feed_url: str = feed_url.strip()
-    webhook_url: str = ""
-    if hooks := reader.get_tag((), "webhooks", []):
-        # Get the webhook URL from the dropdown.
-        for hook in hooks:
-            if hook["name"] == webhook_dropdown:  # type: ignore
-                webhook_url = hook["url"]  # type: ignore
-                break
+
+    # Get the webhook URL from the dropdown.
+    webhook_urls: dict[str, str] = {hook["name"]: hook["url"] for hook in list_webhooks(reader)}
+    webhook_url: str = webhook_urls.get(webhook_dropdown, "")
 
     if not webhook_url:
         # TODO: Show this error on the page.
         raise HTTPException(status_code=404, detail="Webhook not found")
 
-    try:
+    # An already added feed is fine, the webhook is set for it below instead of trying to create a new.
+    with suppress(FeedExistsError):
         # TODO: Check if the feed is valid
         reader.add_feed(clean_feed_url)
-    except FeedExistsError:
-        # Add the webhook to an already added feed if it doesn't have a webhook instead of trying to create a new.
-        try:
-            reader.get_tag(clean_feed_url, "webhook")
-        except TagNotFoundError:
-            reader.set_tag(clean_feed_url, "webhook", webhook_url)  # type: ignore
 
     reader.update_feed(clean_feed_url)
 
@@ -225,6 +271,4 @@ def create_feed(reader: Reader, feed_url: str, webhook_dropdown: str) -> None:
 
     # This is the default message that will be sent to Discord.
     reader.set_tag(clean_feed_url, "custom_message", default_custom_message)  # type: ignore
-
-    # Update the full-text search index so our new feed is searchable.
-    reader.update_search()
+    custom_message.invalidate_feed_cache()
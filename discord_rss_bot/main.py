@@ -1,19 +1,20 @@
 import json
 import urllib.parse
-from collections.abc import Iterable
+from collections.abc import AsyncIterator, Iterable
+from contextlib import asynccontextmanager
 from dataclasses import dataclass
 from datetime import datetime, timezone
 from functools import lru_cache
-from typing import cast
+from typing import Any, Literal
 
 import httpx
 import uvicorn
-from apscheduler.schedulers.background import BackgroundScheduler
-from fastapi import FastAPI, Form, HTTPException, Request
+from apscheduler.schedulers.asyncio import AsyncIOScheduler
+from fastapi import FastAPI, Form, HTTPException, Query, Request
 from fastapi.responses import HTMLResponse
 from fastapi.staticfiles import StaticFiles
-from fastapi.templating import Jinja2Templates
 from httpx import Response
+from jinja2 import Environment, FileSystemBytecodeCache, FileSystemLoader, Template
 from reader import Entry, Feed, FeedNotFoundError, Reader, TagNotFoundError
 from starlette.responses import RedirectResponse
 
@@ -22,12 +23,14 @@ from discord_rss_bot.custom_filters import (
     encode_url,
     entry_is_blacklisted,
     entry_is_whitelisted,
+    invalidate_filter_cache,
 )
 from discord_rss_bot.custom_message import (
     CustomEmbed,
     get_custom_message,
     get_embed,
     get_first_image,
+    invalidate_feed_cache,
     replace_tags_in_text_message,
     save_embed,
 )
@@ -36,19 +39,102 @@ from discord_rss_bot.markdown import convert_html_to_md
 from discord_rss_bot.missing_tags import add_missing_tags
 from discord_rss_bot.search import create_html_for_search_results
 from discord_rss_bot.settings import get_reader
-from discord_rss_bot.webhook import add_webhook, remove_webhook
+from discord_rss_bot.webhook import add_webhook, invalidate_webhooks_cache, list_webhooks, remove_webhook
 
-app: FastAPI = FastAPI()
+reader: Reader = get_reader()
+
+# Runs the jobs on the event loop, it is started when the server starts.
+scheduler: AsyncIOScheduler = AsyncIOScheduler()
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncIterator[None]:  # noqa: ARG001
+    """This is called when the server starts and stops.
+
+    It adds missing tags and starts the scheduler, and stops the scheduler when the server stops.
+
+    Args:
+        app: The FastAPI app.
+    """
+    add_missing_tags(reader=reader)
+
+    # Update all feeds every 15 minutes, this also updates the full-text search index.
+    # TODO: Make this configurable.
+    # If the server was busy and runs were missed, only run it once instead of once for every missed run.
+    scheduler.add_job(
+        send_to_discord,
+        "interval",
+        id="send_to_discord",
+        minutes=15,
+        next_run_time=datetime.now(tz=timezone.utc),
+        coalesce=True,
+        replace_existing=True,
+    )
+    scheduler.start()
+    yield
+    scheduler.shutdown()
+
+
+def update_search_in_background() -> None:
+    """Update the full-text search index in the background.
+
+    If this is called again before the index has been updated, the pending update is reused so it only runs once.
+    """
+    scheduler.add_job(reader.update_search, id="update_search", replace_existing=True)
+
+
+app: FastAPI = FastAPI(lifespan=lifespan)
 app.mount("/static", StaticFiles(directory="discord_rss_bot/static"), name="static")
-templates: Jinja2Templates = Jinja2Templates(directory="discord_rss_bot/templates")
 
-reader: Reader = get_reader()
+# The templates don't change while the bot is running, so don't check them for changes and never evict them.
+# The compiled templates are also stored on disk, so they don't have to be compiled again after a restart.
+env: Environment = Environment(
+    loader=FileSystemLoader("discord_rss_bot/templates"),
+    autoescape=True,
+    auto_reload=settings.reload_templates,
+    cache_size=-1,
+    bytecode_cache=FileSystemBytecodeCache(directory=str(settings.template_cache_dir)),
+)
 
 # Add the filters to the Jinja2 environment so they can be used in html templates.
-templates.env.filters["encode_url"] = encode_url
-templates.env.filters["entry_is_whitelisted"] = entry_is_whitelisted
-templates.env.filters["entry_is_blacklisted"] = entry_is_blacklisted
-templates.env.filters["discord_markdown"] = convert_html_to_md
+env.filters["encode_url"] = encode_url
+env.filters["entry_is_whitelisted"] = entry_is_whitelisted
+env.filters["entry_is_blacklisted"] = entry_is_blacklisted
+env.filters["discord_markdown"] = convert_html_to_md
+
+# Compile all the templates once at startup, after the filters are added.
+compiled_templates: dict[str, Template] = {name: env.get_template(name) for name in env.list_templates()}
+
+
+def render(template_name: str, request: Request, context: dict[str, Any] | None = None) -> HTMLResponse:
+    """Render a precompiled template.
+
+    Args:
+        template_name: The name of the template, e.g. "index.html".
+        request: The request object, this is always passed to the template.
+        context: The rest of the context to render the template with.
+
+    Returns:
+        HTMLResponse: The rendered page.
+    """
+    if settings.reload_templates:
+        template: Template = env.get_template(template_name)
+    else:
+        template: Template = compiled_templates[template_name]
+
+    return HTMLResponse(template.render(context or {}, request=request))
+
+
+def redirect_to_feed(feed_url: str) -> RedirectResponse:
+    """Redirect to the page for a feed.
+
+    Args:
+        feed_url: The URL of the feed, this is stripped and %-escaped.
+
+    Returns:
+        RedirectResponse: Redirect to the feed page.
+    """
+    return RedirectResponse(url=f"/feed/?feed_url={encode_url(feed_url.strip())}", status_code=303)
 
 
 @app.post("/add_webhook")
@@ -83,9 +169,11 @@ async def post_create_feed(feed_url: str = Form(), webhook_dropdown: str = Form(
         feed_url: The feed to add.
         webhook_dropdown: The webhook to use.
     """
-    clean_feed_url: str = feed_url.strip()
     create_feed(reader, feed_url, webhook_dropdown)
-    return RedirectResponse(url=f"/feed/?feed_url={urllib.parse.quote(clean_feed_url)}", status_code=303)
+
+    # Update the full-text search index so our new feed is searchable.
+    update_search_in_background()
+    return redirect_to_feed(feed_url)
 
 
 @app.post("/pause")
@@ -97,7 +185,7 @@ async def post_pause_feed(feed_url: str = Form()) -> RedirectResponse:
     """
     clean_feed_url: str = feed_url.strip()
     reader.disable_feed_updates(clean_feed_url)
-    return RedirectResponse(url=f"/feed/?feed_url={urllib.parse.quote(clean_feed_url)}", status_code=303)
+    return redirect_to_feed(clean_feed_url)
 
 
 @app.post("/unpause")
@@ -109,7 +197,7 @@ async def post_unpause_feed(feed_url: str = Form()) -> RedirectResponse:
     """
     clean_feed_url: str = feed_url.strip()
     reader.enable_feed_updates(clean_feed_url)
-    return RedirectResponse(url=f"/feed/?feed_url={urllib.parse.quote(clean_feed_url)}", status_code=303)
+    return redirect_to_feed(clean_feed_url)
 
 
 @app.post("/whitelist")
@@ -138,36 +226,20 @@ async def post_set_whitelist(
         reader.set_tag(clean_feed_url, "whitelist_content", whitelist_content)  # type: ignore
     if whitelist_author:
         reader.set_tag(clean_feed_url, "whitelist_author", whitelist_author)  # type: ignore
+    invalidate_filter_cache()
 
-    return RedirectResponse(url=f"/feed/?feed_url={urllib.parse.quote(clean_feed_url)}", status_code=303)
+    return redirect_to_feed(clean_feed_url)
 
 
 @app.get("/whitelist", response_class=HTMLResponse)
-async def get_whitelist(feed_url: str, request: Request):  # noqa: ANN201
+async def get_whitelist(feed_url: str, request: Request) -> HTMLResponse:
     """Get the whitelist.
 
     Args:
         feed_url: What feed we should get the whitelist for.
         request: The request object.
     """
-    clean_feed_url: str = feed_url.strip()
-    feed: Feed = reader.get_feed(urllib.parse.unquote(clean_feed_url))
-
-    # Get previous data, this is used when creating the form.
-    whitelist_title: str = str(reader.get_tag(feed, "whitelist_title", ""))
-    whitelist_summary: str = str(reader.get_tag(feed, "whitelist_summary", ""))
-    whitelist_content: str = str(reader.get_tag(feed, "whitelist_content", ""))
-    whitelist_author: str = str(reader.get_tag(feed, "whitelist_author", ""))
-
-    context = {
-        "request": request,
-        "feed": feed,
-        "whitelist_title": whitelist_title,
-        "whitelist_summary": whitelist_summary,
-        "whitelist_content": whitelist_content,
-        "whitelist_author": whitelist_author,
-    }
-    return templates.TemplateResponse("whitelist.html", context)
+    return render_filter_page("whitelist", feed_url, request)
 
 
 @app.post("/blacklist")
@@ -199,29 +271,44 @@ async def post_set_blacklist(
         reader.set_tag(clean_feed_url, "blacklist_content", blacklist_content)  # type: ignore
     if blacklist_author:
         reader.set_tag(clean_feed_url, "blacklist_author", blacklist_author)  # type: ignore
+    invalidate_filter_cache()
 
-    return RedirectResponse(url=f"/feed/?feed_url={urllib.parse.quote(clean_feed_url)}", status_code=303)
+    return redirect_to_feed(clean_feed_url)
 
 
 @app.get("/blacklist", response_class=HTMLResponse)
-async def get_blacklist(feed_url: str, request: Request):  # noqa: ANN201
-    feed: Feed = reader.get_feed(urllib.parse.unquote(feed_url))
+async def get_blacklist(feed_url: str, request: Request) -> HTMLResponse:
+    """Get the blacklist.
 
-    # Get previous data, this is used when creating the form.
-    blacklist_title: str = str(reader.get_tag(feed, "blacklist_title", ""))
-    blacklist_summary: str = str(reader.get_tag(feed, "blacklist_summary", ""))
-    blacklist_content: str = str(reader.get_tag(feed, "blacklist_content", ""))
-    blacklist_author: str = str(reader.get_tag(feed, "blacklist_author", ""))
+    Args:
+        feed_url: What feed we should get the blacklist for.
+        request: The request object.
+    """
+    return render_filter_page("blacklist", feed_url, request)
 
-    context = {
-        "request": request,
-        "feed": feed,
-        "blacklist_title": blacklist_title,
-        "blacklist_summary": blacklist_summary,
-        "blacklist_content": blacklist_content,
-        "blacklist_author": blacklist_author,
-    }
-    return templates.TemplateResponse("blacklist.html", context)
+
+def render_filter_page(filter_type: Literal["whitelist", "blacklist"], feed_url: str, request: Request) -> HTMLResponse:
+    """Render the whitelist or blacklist page for a feed.
+
+    Args:
+        filter_type: If this is the whitelist or blacklist page.
+        feed_url: What feed we should get the whitelist or blacklist for.
+        request: The request object.
+
+    Returns:
+        HTMLResponse: The whitelist or blacklist page.
+    """
+    feed: Feed = reader.get_feed(urllib.parse.unquote(feed_url.strip()))
+
+    # Get previous data, this is used when creating the form. Get all the tags at once instead of one at a time.
+    tags: dict[str, Any] = dict(reader.get_tags(feed))
+
+    context: dict[str, Any] = {"feed": feed}
+    for field in ("title", "summary", "content", "author"):
+        tag: str = f"{filter_type}_{field}"
+        context[tag] = str(tags.get(tag, ""))
+
+    return render(f"{filter_type}.html", request, context)
 
 
 @app.post("/custom")
@@ -236,13 +323,13 @@ async def post_set_custom(custom_message: str = Form(""), feed_url: str = Form()
         reader.set_tag(feed_url, "custom_message", custom_message.strip())  # type: ignore
     else:
         reader.set_tag(feed_url, "custom_message", settings.default_custom_message)  # type: ignore
+    invalidate_feed_cache()
 
-    clean_feed_url: str = feed_url.strip()
-    return RedirectResponse(url=f"/feed/?feed_url={urllib.parse.quote(clean_feed_url)}", status_code=303)
+    return redirect_to_feed(feed_url)
 
 
 @app.get("/custom", response_class=HTMLResponse)
-async def get_custom(feed_url: str, request: Request):  # noqa: ANN201
+async def get_custom(feed_url: str, request: Request) -> HTMLResponse:
     """Get the custom message. This is used when sending the message to Discord.
 
     Args:
@@ -252,7 +339,6 @@ async def get_custom(feed_url: str, request: Request):  # noqa: ANN201
     feed: Feed = reader.get_feed(urllib.parse.unquote(feed_url.strip()))
 
     context = {
-        "request": request,
         "feed": feed,
         "custom_message": get_custom_message(reader, feed),
     }
@@ -261,11 +347,11 @@ async def get_custom(feed_url: str, request: Request):  # noqa: ANN201
     for entry in reader.get_entries(feed=feed, limit=1):
         context["entry"] = entry
 
-    return templates.TemplateResponse("custom.html", context)
+    return render("custom.html", request, context)
 
 
 @app.get("/embed", response_class=HTMLResponse)
-async def get_embed_page(feed_url: str, request: Request):  # noqa: ANN201
+async def get_embed_page(feed_url: str, request: Request) -> HTMLResponse:
     """Get the custom message. This is used when sending the message to Discord.
 
     Args:
@@ -278,7 +364,6 @@ async def get_embed_page(feed_url: str, request: Request):  # noqa: ANN201
     embed: CustomEmbed = get_embed(reader, feed)
 
     context = {
-        "request": request,
         "feed": feed,
         "title": embed.title,
         "description": embed.description,
@@ -297,7 +382,7 @@ async def get_embed_page(feed_url: str, request: Request):  # noqa: ANN201
     for entry in reader.get_entries(feed=feed, limit=1):
         # Append to context.
         context["entry"] = entry
-    return templates.TemplateResponse("embed.html", context)
+    return render("embed.html", request, context)
 
 
 @app.post("/embed", response_class=HTMLResponse)
@@ -351,7 +436,7 @@ async def post_embed(  # noqa: PLR0913
     # Save the data.
     save_embed(reader, feed, custom_embed)
 
-    return RedirectResponse(url=f"/feed/?feed_url={urllib.parse.quote(clean_feed_url)}", status_code=303)
+    return redirect_to_feed(clean_feed_url)
 
 
 @app.post("/use_embed")
@@ -366,7 +451,7 @@ async def post_use_embed(feed_url: str = Form()) -> RedirectResponse:
     """
     clean_feed_url: str = feed_url.strip()
     reader.set_tag(clean_feed_url, "should_send_embed", True)  # type: ignore
-    return RedirectResponse(url=f"/feed/?feed_url={urllib.parse.quote(clean_feed_url)}", status_code=303)
+    return redirect_to_feed(clean_feed_url)
 
 
 @app.post("/use_text")
@@ -381,26 +466,26 @@ async def post_use_text(feed_url: str = Form()) -> RedirectResponse:
     """
     clean_feed_url: str = feed_url.strip()
     reader.set_tag(clean_feed_url, "should_send_embed", False)  # type: ignore
-    return RedirectResponse(url=f"/feed/?feed_url={urllib.parse.quote(clean_feed_url)}", status_code=303)
+    return redirect_to_feed(clean_feed_url)
 
 
 @app.get("/add", response_class=HTMLResponse)
-def get_add(request: Request):  # noqa: ANN201
+def get_add(request: Request) -> HTMLResponse:
     """Page for adding a new feed."""
     context = {
-        "request": request,
-        "webhooks": reader.get_tag((), "webhooks", []),
+        "webhooks": list_webhooks(reader),
     }
-    return templates.TemplateResponse("add.html", context)
+    return render("add.html", request, context)
 
 
 @app.get("/feed", response_class=HTMLResponse)
-async def get_feed(feed_url: str, request: Request):  # noqa: ANN201
+def get_feed(feed_url: str, request: Request, limit: int = Query(200, ge=1)) -> HTMLResponse:
     """Get a feed by URL.
 
     Args:
         feed_url: The feed to add.
         request: The request object.
+        limit: How many entries to show.
 
     Returns:
         HTMLResponse: The feed page.
@@ -409,8 +494,8 @@ async def get_feed(feed_url: str, request: Request):  # noqa: ANN201
 
     feed: Feed = reader.get_feed(clean_feed_url)
 
-    # Get entries from the feed.
-    entries: Iterable[Entry] = reader.get_entries(feed=clean_feed_url)
+    # Get the newest entries from the feed. Only fetch as many as we show, and fetch them all before rendering.
+    entries: list[Entry] = list(reader.get_entries(feed=clean_feed_url, limit=limit))
 
     # Create the html for the entries.
     html: str = create_html_for_feed(entries)
@@ -422,14 +507,13 @@ async def get_feed(feed_url: str, request: Request):  # noqa: ANN201
         should_send_embed: bool = bool(reader.get_tag(feed, "should_send_embed"))
 
     context = {
-        "request": request,
         "feed": feed,
         "entries": entries,
         "feed_counts": reader.get_feed_counts(feed=clean_feed_url),
         "html": html,
         "should_send_embed": should_send_embed,
     }
-    return templates.TemplateResponse("feed.html", context)
+    return render("feed.html", request, context)
 
 
 def create_html_for_feed(entries: Iterable[Entry]) -> str:
@@ -442,10 +526,7 @@ def create_html_for_feed(entries: Iterable[Entry]) -> str:
     for entry in entries:
         first_image: str = ""
         summary: str | None = entry.summary
-        content = ""
-        if entry.content:
-            for content_item in entry.content:
-                content: str = content_item.value
+        content: str = entry.content[0].value if entry.content else ""
 
         first_image = get_first_image(summary, content)
 
@@ -462,7 +543,7 @@ def create_html_for_feed(entries: Iterable[Entry]) -> str:
         if entry_is_whitelisted(entry):
             whitelisted = "<span class='badge bg-success'>Whitelisted</span>"
 
-        entry_id: str = urllib.parse.quote(entry.id)
+        entry_id: str = encode_url(entry.id)
         to_discord_html: str = f"<a class='text-muted' href='/post_entry?entry_id={entry_id}'>Send to Discord</a>"
         image_html: str = f"<img src='{first_image}' class='img-fluid'>" if first_image else ""
 
@@ -478,7 +559,7 @@ def create_html_for_feed(entries: Iterable[Entry]) -> str:
 
 
 @app.get("/add_webhook", response_class=HTMLResponse)
-async def get_add_webhook(request: Request):  # noqa: ANN201
+async def get_add_webhook(request: Request) -> HTMLResponse:
     """Page for adding a new webhook.
 
     Args:
@@ -487,7 +568,7 @@ async def get_add_webhook(request: Request):  # noqa: ANN201
     Returns:
     HTMLResponse: The add webhook page.
     """
-    return templates.TemplateResponse("add_webhook.html", {"request": request})
+    return render("add_webhook.html", request)
 
 
 @dataclass()
@@ -533,7 +614,7 @@ def get_data_from_hook_url(hook_name: str, hook_url: str) -> WebhookInfo:
 
 
 @app.get("/webhooks", response_class=HTMLResponse)
-async def get_webhooks(request: Request):  # noqa: ANN201
+async def get_webhooks(request: Request) -> HTMLResponse:
     """Page for adding a new webhook.
 
     Args:
@@ -544,16 +625,16 @@ async def get_webhooks(request: Request):  # noqa: ANN201
     """
     hooks_with_data = []
 
-    for hook in list(reader.get_tag((), "webhooks", [])):
-        our_hook: WebhookInfo = get_data_from_hook_url(hook_url=hook["url"], hook_name=hook["name"])  # type: ignore
+    for hook in list_webhooks(reader):
+        our_hook: WebhookInfo = get_data_from_hook_url(hook_url=hook["url"], hook_name=hook["name"])
         hooks_with_data.append(our_hook)
 
-    context = {"request": request, "hooks_with_data": hooks_with_data}
-    return templates.TemplateResponse("webhooks.html", context)
+    context = {"hooks_with_data": hooks_with_data}
+    return render("webhooks.html", request, context)
 
 
 @app.get("/", response_class=HTMLResponse)
-def get_index(request: Request):  # noqa: ANN201
+def get_index(request: Request) -> HTMLResponse:
     """This is the root of the website.
 
     Args:
@@ -562,19 +643,17 @@ def get_index(request: Request):  # noqa: ANN201
     Returns:
         HTMLResponse: The index page.
     """
-    return templates.TemplateResponse("index.html", make_context_index(request))
+    return render("index.html", request, make_context_index())
 
 
-def make_context_index(request: Request):  # noqa: ANN201
+def make_context_index() -> dict[str, Any]:
     """Create the needed context for the index page.
 
-    Args:
-        request: The request object.
-
     Returns:
-            dict: The context for the index page.
+        dict: The context for the index page.
     """
-    hooks: list[dict] = list(reader.get_tag((), "webhooks", []))  # type: ignore
+    hooks: list[dict[str, str]] = list_webhooks(reader)
+    webhook_urls: set[str] = {hook["url"] for hook in hooks}
 
     feed_list = []
     broken_feeds = []
@@ -589,12 +668,10 @@ def make_context_index(request: Request):  # noqa: ANN201
             broken_feeds.append(feed)
             continue
 
-        webhook_list = [hook["url"] for hook in hooks]
-        if webhook not in webhook_list:
+        if webhook not in webhook_urls:
             feeds_without_attached_webhook.append(feed)
 
     return {
-        "request": request,
         "feeds": feed_list,
         "feed_count": reader.get_feed_counts(),
         "entry_count": reader.get_entry_counts(),
@@ -605,7 +682,7 @@ def make_context_index(request: Request):  # noqa: ANN201
 
 
 @app.post("/remove", response_class=HTMLResponse)
-async def remove_feed(feed_url: str = Form()):  # noqa: ANN201
+async def remove_feed(feed_url: str = Form()) -> RedirectResponse:
     """Get a feed by URL.
 
     Args:
@@ -619,11 +696,18 @@ async def remove_feed(feed_url: str = Form()):  # noqa: ANN201
     except FeedNotFoundError as e:
         raise HTTPException(status_code=404, detail="Feed not found") from e
 
+    # The feed is gone, so its custom_message, embed and filters should be too.
+    invalidate_feed_cache()
+    invalidate_filter_cache()
+
+    # Remove the feed's entries from the full-text search index.
+    update_search_in_background()
+
     return RedirectResponse(url="/", status_code=303)
 
 
 @app.get("/search", response_class=HTMLResponse)
-async def search(request: Request, query: str):  # noqa: ANN201
+def search(request: Request, query: str) -> HTMLResponse:
     """Get entries matching a full-text search query.
 
     Args:
@@ -633,15 +717,16 @@ async def search(request: Request, query: str):  # noqa: ANN201
     Returns:
         HTMLResponse: The search page.
     """
-    reader.update_search()
+    # The search index is kept up to date in the background, but search has to be enabled before we can search.
+    if not reader.is_search_enabled():
+        reader.update_search()
 
     context = {
-        "request": request,
         "search_html": create_html_for_search_results(query),
         "query": query,
         "search_amount": reader.search_entry_counts(query),
     }
-    return templates.TemplateResponse("search.html", context)
+    return render("search.html", request, context)
 
 
 @app.get("/post_entry", response_class=HTMLResponse)
@@ -663,12 +748,11 @@ async def post_entry(entry_id: str):  # noqa: ANN201
         return result
 
     # Redirect to the feed page.
-    clean_feed_url: str = entry.feed.url.strip()
-    return RedirectResponse(url=f"/feed/?feed_url={urllib.parse.quote(clean_feed_url)}", status_code=303)
+    return redirect_to_feed(entry.feed.url)
 
 
 @app.post("/modify_webhook", response_class=HTMLResponse)
-def modify_webhook(old_hook: str = Form(), new_hook: str = Form()):  # noqa: ANN201
+def modify_webhook(old_hook: str = Form(), new_hook: str = Form()) -> RedirectResponse:
     """Modify a webhook.
 
     Args:
@@ -678,12 +762,7 @@ def modify_webhook(old_hook: str = Form(), new_hook: str = Form()):  # noqa: ANN
     Raises:
         HTTPException: Webhook could not be modified.
     """
-    # Get current webhooks from the database if they exist otherwise use an empty list.
-    webhooks = list(reader.get_tag((), "webhooks", []))
-
-    # Webhooks are stored as a list of dictionaries.
-    # Example: [{"name": "webhook_name", "url": "webhook_url"}]  # noqa: ERA001
-    webhooks = cast(list[dict[str, str]], webhooks)
+    webhooks: list[dict[str, str]] = list_webhooks(reader)
 
     for hook in webhooks:
         if hook["url"] in old_hook.strip():
@@ -695,6 +774,7 @@ def modify_webhook(old_hook: str = Form(), new_hook: str = Form()):  # noqa: ANN
 
             # Add our new list of webhooks to the database.
             reader.set_tag((), "webhooks", webhooks)  # type: ignore
+            invalidate_webhooks_cache()
 
             # Loop through all feeds and update the webhook if it
             # matches the old one.
@@ -712,22 +792,6 @@ def modify_webhook(old_hook: str = Form(), new_hook: str = Form()):  # noqa: ANN
     return RedirectResponse(url="/webhooks", status_code=303)
 
 
-@app.on_event("startup")
-def startup() -> None:
-    """This is called when the server starts.
-
-    It adds missing tags and starts the scheduler.
-    """
-    add_missing_tags(reader=reader)
-
-    scheduler: BackgroundScheduler = BackgroundScheduler()
-
-    # Update all feeds every 15 minutes.
-    # TODO: Make this configurable.
-    scheduler.add_job(send_to_discord, "interval", minutes=15, next_run_time=datetime.now(tz=timezone.utc))
-    scheduler.start()
-
-
 if __name__ == "__main__":
     # TODO: Make this configurable.
     uvicorn.run(
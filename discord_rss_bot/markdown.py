@@ -1,9 +1,14 @@
+from functools import lru_cache
+
 from bs4 import BeautifulSoup
 
 
+@lru_cache(maxsize=2048)
 def convert_html_to_md(html: str) -> str:
     """Convert HTML to markdown.
 
+    The result is cached, entries in the same feed often share the same HTML.
+
     Args:
         html: The HTML to convert.
 
@@ -1,15 +1,21 @@
+import logging
+
 from reader import Feed, Reader, TagNotFoundError
 
+from discord_rss_bot.custom_message import invalidate_feed_cache
 from discord_rss_bot.settings import default_custom_embed, default_custom_message
 
+logger: logging.Logger = logging.getLogger(__name__)
+
 
 def add_custom_message(reader: Reader, feed: Feed) -> None:
     try:
         reader.get_tag(feed, "custom_message")
     except TagNotFoundError:
-        print(f"Adding custom_message tag to '{feed.url}'")
+        logger.info("Adding custom_message tag to '%s'", feed.url)
         reader.set_tag(feed.url, "custom_message", default_custom_message)  # type: ignore
         reader.set_tag(feed.url, "has_custom_message", True)  # type: ignore
+        invalidate_feed_cache()
 
 
 def add_has_custom_message(reader: Reader, feed: Feed) -> None:
@@ -17,10 +23,10 @@ def add_has_custom_message(reader: Reader, feed: Feed) -> None:
         reader.get_tag(feed, "has_custom_message")
     except TagNotFoundError:
         if reader.get_tag(feed, "custom_message") == default_custom_message:
-            print(f"Setting has_custom_message tag to False for '{feed.url}'")
+            logger.info("Setting has_custom_message tag to False for '%s'", feed.url)
             reader.set_tag(feed.url, "has_custom_message", False)  # type: ignore
         else:
-            print(f"Setting has_custom_message tag to True for '{feed.url}'")
+            logger.info("Setting has_custom_message tag to True for '%s'", feed.url)
             reader.set_tag(feed.url, "has_custom_message", True)  # type: ignore
 
 
@@ -28,7 +34,7 @@ def add_if_embed(reader: Reader, feed: Feed) -> None:
     try:
         reader.get_tag(feed, "if_embed")
     except TagNotFoundError:
-        print(f"Setting if_embed tag to True for '{feed.url}'")
+        logger.info("Setting if_embed tag to True for '%s'", feed.url)
         reader.set_tag(feed.url, "if_embed", True)  # type: ignore
 
 
@@ -36,9 +42,10 @@ def add_custom_embed(reader: Reader, feed: Feed) -> None:
     try:
         reader.get_tag(feed, "embed")
     except TagNotFoundError:
-        print(f"Setting embed tag to default for '{feed.url}'")
+        logger.info("Setting embed tag to default for '%s'", feed.url)
         reader.set_tag(feed.url, "embed", default_custom_embed)  # type: ignore
         reader.set_tag(feed.url, "has_custom_embed", True)  # type: ignore
+        invalidate_feed_cache()
 
 
 def add_has_custom_embed(reader: Reader, feed: Feed) -> None:
@@ -46,10 +53,10 @@ def add_has_custom_embed(reader: Reader, feed: Feed) -> None:
         reader.get_tag(feed, "has_custom_embed")
     except TagNotFoundError:
         if reader.get_tag(feed, "embed") == default_custom_embed:
-            print(f"Setting has_custom_embed tag to False for '{feed.url}'")
+            logger.info("Setting has_custom_embed tag to False for '%s'", feed.url)
             reader.set_tag(feed.url, "has_custom_embed", False)  # type: ignore
         else:
-            print(f"Setting has_custom_embed tag to True for '{feed.url}'")
+            logger.info("Setting has_custom_embed tag to True for '%s'", feed.url)
             reader.set_tag(feed.url, "has_custom_embed", True)  # type: ignore
 
 
@@ -57,7 +64,7 @@ def add_should_send_embed(reader: Reader, feed: Feed) -> None:
     try:
         reader.get_tag(feed, "should_send_embed")
     except TagNotFoundError:
-        print(f"Setting should_send_embed tag to True for '{feed.url}'")
+        logger.info("Setting should_send_embed tag to True for '%s'", feed.url)
         reader.set_tag(feed.url, "should_send_embed", True)  # type: ignore
 
 
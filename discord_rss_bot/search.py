@@ -1,8 +1,8 @@
-import urllib.parse
 from typing import TYPE_CHECKING
 
 from reader import EntrySearchResult, Feed, HighlightedString, Reader
 
+from discord_rss_bot.custom_filters import encode_url
 from discord_rss_bot.settings import get_reader
 
 if TYPE_CHECKING:
@@ -32,7 +32,7 @@ def create_html_for_search_results(query: str, custom_reader: Reader | None = No
         if ".summary" in result.content:
             result_summary: str = add_span_with_slice(result.content[".summary"])
             feed: Feed = reader.get_feed(result.feed_url)
-            feed_url: str = urllib.parse.quote(feed.url)
+            feed_url: str = encode_url(feed.url)
 
             html += f"""
             <div class="p-2 mb-2 border border-dark">
@@ -1,12 +1,30 @@
+import logging
+import os
+import sys
 from functools import lru_cache
 from pathlib import Path
 
 from platformdirs import user_data_dir
 from reader import Reader, make_reader
 
+# Show our INFO messages (e.g. when missing tags are added) on stdout, uvicorn only configures its own loggers.
+logger: logging.Logger = logging.getLogger("discord_rss_bot")
+if not logger.handlers:
+    log_handler: logging.StreamHandler = logging.StreamHandler(sys.stdout)
+    log_handler.setFormatter(logging.Formatter("%(levelname)s:     %(name)s - %(message)s"))
+    logger.addHandler(log_handler)
+    logger.setLevel(logging.INFO)
+
 data_dir: str = user_data_dir(appname="discord_rss_bot", appauthor="TheLovinator", roaming=True, ensure_exists=True)
 print(f"Data is stored in '{data_dir}'.")
 
+# Set RELOAD_TEMPLATES=1 to reload the templates when they are changed, this is useful when working on them.
+reload_templates: bool = os.getenv("RELOAD_TEMPLATES", "").lower() in {"1", "true", "yes"}
+
+# Compiled templates are cached here, so we don't have to compile them again after a restart.
+template_cache_dir: Path = Path(data_dir) / "template_cache"
+template_cache_dir.mkdir(exist_ok=True)
+
 
 # TODO: Add default things to the database and make the edible.
 default_custom_message: str = "{{entry_title}}\n{{entry_link}}"
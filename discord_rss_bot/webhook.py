@@ -1,3 +1,4 @@
+from functools import lru_cache
 from typing import cast
 
 from fastapi import HTTPException
@@ -6,6 +7,41 @@ from reader import Reader
 from discord_rss_bot.missing_tags import add_missing_tags
 
 
+@lru_cache(maxsize=8)
+def get_cached_webhooks(reader: Reader) -> tuple[dict[str, str], ...]:
+    """Get the webhooks tag, this is cached so we don't have to read it from the database on every page load.
+
+    Args:
+        reader: The Reader to use
+
+    Returns:
+        The webhooks, as a tuple of dictionaries with a name and url.
+    """
+    # Webhooks are stored as a list of dictionaries.
+    # Example: [{"name": "webhook_name", "url": "webhook_url"}]  # noqa: ERA001
+    return tuple(cast(list[dict[str, str]], reader.get_tag((), "webhooks", [])))
+
+
+def list_webhooks(reader: Reader) -> list[dict[str, str]]:
+    """Get the webhooks from the database if they exist otherwise an empty list.
+
+    Args:
+        reader: The Reader to use
+
+    Returns:
+        A copy of the cached webhooks, so it can be changed without changing the cache.
+    """
+    return [dict(webhook) for webhook in get_cached_webhooks(reader)]
+
+
+def invalidate_webhooks_cache() -> None:
+    """Forget the cached webhooks.
+
+    This has to be called every time the webhooks tag is changed.
+    """
+    get_cached_webhooks.cache_clear()
+
+
 def add_webhook(reader: Reader, webhook_name: str, webhook_url: str) -> None:
     """Add new webhook.
 
@@ -17,20 +53,16 @@ def add_webhook(reader: Reader, webhook_name: str, webhook_url: str) -> None:
     Raises:
         HTTPException: This is raised when the webhook already exists
     """
-    # Get current webhooks from the database if they exist otherwise use an empty list.
-    webhooks = list(reader.get_tag((), "webhooks", []))
-
-    # Webhooks are stored as a list of dictionaries.
-    # Example: [{"name": "webhook_name", "url": "webhook_url"}]  # noqa: ERA001
-    webhooks = cast(list[dict[str, str]], webhooks)
+    webhooks: list[dict[str, str]] = list_webhooks(reader)
 
     # Only add the webhook if it doesn't already exist.
-    if all(webhook["name"] != webhook_name.strip() for webhook in webhooks):
+    if webhook_name.strip() not in {webhook["name"] for webhook in webhooks}:
         # Add the new webhook to the list of webhooks.
         webhooks.append({"name": webhook_name.strip(), "url": webhook_url.strip()})
 
         # Add our new list of webhooks to the database.
         reader.set_tag((), "webhooks", webhooks)  # type: ignore
+        invalidate_webhooks_cache()
 
         add_missing_tags(reader)
         return
@@ -48,29 +80,20 @@ def remove_webhook(reader: Reader, webhook_url: str) -> None:
         webhook_url (str): The webhook URL to remove
 
     Raises:
-        HTTPException: If webhook could not be deleted
         HTTPException: Webhook not found
     """
-    # TODO: Replace HTTPException with a custom exception for both of these.
-    # Get current webhooks from the database if they exist otherwise use an empty list.
-    webhooks = list(reader.get_tag((), "webhooks", []))
-
-    # Webhooks are stored as a list of dictionaries.
-    # Example: [{"name": "webhook_name", "url": "webhook_url"}]  # noqa: ERA001
-    webhooks = cast(list[dict[str, str]], webhooks)
-
-    # Only add the webhook if it doesn't already exist.
-    for webhook in webhooks:
-        if webhook["url"] in webhook_url.strip():
-            webhooks.remove(webhook)
+    # TODO: Replace HTTPException with a custom exception.
+    webhooks: list[dict[str, str]] = list_webhooks(reader)
 
-            # Check if it has been removed.
-            if webhook in webhooks:
-                raise HTTPException(status_code=500, detail="Webhook could not be deleted")
+    # Keep every webhook except the one we want to remove.
+    clean_webhook_url: str = webhook_url.strip()
+    new_webhooks: list[dict[str, str]] = [webhook for webhook in webhooks if webhook["url"] != clean_webhook_url]
 
-            # Add our new list of webhooks to the database.
-            reader.set_tag((), "webhooks", webhooks)  # type: ignore
-            return
+    if len(new_webhooks) != len(webhooks):
+        # Add our new list of webhooks to the database.
+        reader.set_tag((), "webhooks", new_webhooks)  # type: ignore
+        invalidate_webhooks_cache()
+        return
 
     # TODO: Show this error on the page.
     raise HTTPException(status_code=404, detail="Webhook not found")
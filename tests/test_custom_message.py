@@ -0,0 +1,223 @@
+import tempfile
+from datetime import datetime, timezone
+from pathlib import Path
+
+import pytest
+from reader import Content, Entry, Feed, Reader, make_reader
+
+from discord_rss_bot import custom_message
+from discord_rss_bot.custom_message import (
+    CustomEmbed,
+    get_custom_message,
+    get_embed,
+    get_first_image,
+    get_replacements,
+    get_used_tags,
+    invalidate_feed_cache,
+    replace_tags_in_embed,
+    replace_tags_in_text_message,
+    save_embed,
+    try_to_replace,
+)
+
+feed_url: str = "https://lovinator.space/rss_test.xml"
+
+
+def get_reader() -> Reader:
+    tempdir: Path = Path(tempfile.mkdtemp())
+
+    reader_database: Path = tempdir / "test.sqlite"
+    reader: Reader = make_reader(url=str(reader_database))
+
+    return reader
+
+
+def test_get_first_image() -> None:
+    summary: str = '<p>Summary <b>text</b> <img src="https://example.com/summary.png"></p>'
+    content: str = (
+        '<div><p>Content <img alt="first" src="https://example.com/first.png"></p>'
+        '<img src="https://example.com/second.png"></div>'
+    )
+
+    # Content is checked before the summary
+    assert get_first_image(summary, content) == "https://example.com/first.png"
+
+    # Fall back to the summary if the content has no images
+    assert get_first_image(summary, "<p>No images here</p>") == "https://example.com/summary.png"
+    assert get_first_image(summary, "") == "https://example.com/summary.png"
+
+    # No images at all
+    assert get_first_image("<p>No images</p>", "<p>Nothing</p>") == ""
+    assert get_first_image("", "") == ""
+
+
+def test_try_to_replace() -> None:
+    replacements: dict[str, str] = {
+        "{{entry_title}}": "Hello",
+        "{{entry_link}}": "https://example.com/",
+    }
+
+    assert try_to_replace("{{entry_title}} {{entry_link}}", replacements) == "Hello https://example.com/"
+
+    # The same tag can be used more than once
+    assert try_to_replace("{{entry_title}}{{entry_title}}", replacements) == "HelloHello"
+
+    # Unknown tags are left as they are
+    assert try_to_replace("{{feed_title}} {{entry_title}}", replacements) == "{{feed_title}} Hello"
+
+    # A literal \n is only replaced if we ask for it
+    assert try_to_replace("{{entry_title}}\\n", replacements) == "Hello\\n"
+    assert try_to_replace("{{entry_title}}\\n", {**replacements, "\\n": "\n"}) == "Hello\n"
+
+    # Replaced values are not searched for more tags
+    assert try_to_replace("{{entry_title}}", {"{{entry_title}}": "{{entry_link}}"}) == "{{entry_link}}"
+
+    # If there is nothing to replace tags in, return it as is
+    assert try_to_replace(None, replacements) is None  # type: ignore
+
+
+def test_get_custom_message() -> None:
+    reader: Reader = get_reader()
+    reader.add_feed(feed_url)
+    feed: Feed = reader.get_feed(feed_url)
+
+    # No custom_message tag
+    assert get_custom_message(reader, feed) == ""
+
+    # The tag is cached until the cache is invalidated
+    reader.set_tag(feed, "custom_message", "{{entry_title}}")  # type: ignore
+    assert get_custom_message(reader, feed) == ""
+    invalidate_feed_cache()
+    assert get_custom_message(reader, feed) == "{{entry_title}}"
+
+
+def test_save_embed() -> None:
+    reader: Reader = get_reader()
+    reader.add_feed(feed_url)
+    feed: Feed = reader.get_feed(feed_url)
+
+    # Get the default embed and change it
+    embed: CustomEmbed = get_embed(reader, feed)
+    assert embed.title == ""
+    embed.title = "{{entry_title}}"
+
+    # Saving the embed should invalidate the cache
+    save_embed(reader, feed, embed)
+    assert get_embed(reader, feed).title == "{{entry_title}}"
+
+    # Changing the returned embed should not change the cached one
+    get_embed(reader, feed).title = "Changed"
+    assert get_embed(reader, feed).title == "{{entry_title}}"
+
+
+def make_entry(feed: Feed, content: str = "<p>Content <b>bold</b></p>") -> Entry:
+    return Entry(
+        id="entry-1",
+        feed=feed,
+        title="Entry title",
+        link="https://example.com/entry-1",
+        summary='<p>Summary <i>text</i> <img src="https://example.com/summary.png"></p>',
+        content=(Content(value=content),) if content else (),
+        published=datetime(2024, 1, 2, 3, 4, 5, tzinfo=timezone.utc),  # noqa: UP017
+    )
+
+
+def test_get_used_tags() -> None:
+    assert get_used_tags("{{entry_title}} {{entry_link}}", "{{entry_title}}\\n") == {
+        "{{entry_title}}",
+        "{{entry_link}}",
+        "\\n",
+    }
+
+    # Anything that isn't a string is ignored
+    assert get_used_tags(None, "") == set()  # type: ignore
+
+
+def test_get_replacements() -> None:
+    feed: Feed = Feed(url=feed_url, title="Feed title")
+    entry: Entry = make_entry(feed)
+
+    replacements: dict[str, str] = get_replacements(
+        feed,
+        entry,
+        {"{{entry_content}}", "{{entry_summary}}", "{{entry_text}}", "{{image_1}}"},
+    )
+    assert replacements["{{entry_title}}"] == "Entry title"
+    assert replacements["{{feed_title}}"] == "Feed title"
+    assert replacements["{{entry_content}}"] == "Content **bold**"
+    assert replacements["{{entry_summary}}"] == "Summary *text*"
+    assert replacements["{{entry_text}}"] == "Content **bold**"
+    assert replacements["{{image_1}}"] == "https://example.com/summary.png"
+
+    # Values that aren't strings are replaced with them as strings
+    assert replacements["{{entry_published}}"] == "2024-01-02 03:04:05+00:00"
+    assert replacements["{{entry_read}}"] == "False"
+
+    # Values that are None aren't replaced, so the tag is left as it is
+    assert "{{feed_author}}" not in replacements
+    assert "{{entry_updated}}" not in replacements
+    assert try_to_replace("{{feed_author}}", replacements) == "{{feed_author}}"
+
+
+def test_get_replacements_entry_text_uses_summary() -> None:
+    feed: Feed = Feed(url=feed_url)
+
+    # {{entry_text}} is the summary if there is no content
+    replacements: dict[str, str] = get_replacements(feed, make_entry(feed, content=""), {"{{entry_text}}"})
+    assert replacements["{{entry_text}}"] == "Summary *text*"
+    assert not replacements["{{entry_content}}"]
+
+
+def test_get_replacements_skips_unused_tags(monkeypatch: pytest.MonkeyPatch) -> None:
+    converted: list[str] = []
+    images: list[str] = []
+    monkeypatch.setattr(custom_message, "convert_html_to_md", lambda html: converted.append(html) or html)
+    monkeypatch.setattr(custom_message, "get_first_image", lambda _summary, content: images.append(content) or "")
+
+    feed: Feed = Feed(url=feed_url)
+    replacements: dict[str, str] = get_replacements(feed, make_entry(feed), {"{{entry_title}}"})
+
+    # Nothing is converted to Markdown and we don't look for images if those tags aren't used
+    assert replacements["{{entry_title}}"] == "Entry title"
+    assert not replacements["{{entry_text}}"]
+    assert not replacements["{{image_1}}"]
+    assert converted == []
+    assert images == []
+
+    # Only the content is converted for {{entry_text}} if there is content
+    get_replacements(feed, make_entry(feed), {"{{entry_text}}"})
+    assert converted == ["<p>Content <b>bold</b></p>"]
+
+
+def test_replace_tags_in_text_message(monkeypatch: pytest.MonkeyPatch) -> None:
+    reader: Reader = get_reader()
+    monkeypatch.setattr(custom_message, "get_reader", lambda: reader)
+    reader.add_feed(feed_url)
+    reader.set_tag(feed_url, "custom_message", "{{entry_title}}\\n{{entry_published}} {{feed_author}}")  # type: ignore
+    invalidate_feed_cache()
+
+    entry: Entry = make_entry(reader.get_feed(feed_url))
+    assert replace_tags_in_text_message(entry) == "Entry title\n2024-01-02 03:04:05+00:00 {{feed_author}}"
+
+
+def test_replace_tags_in_embed(monkeypatch: pytest.MonkeyPatch) -> None:
+    reader: Reader = get_reader()
+    monkeypatch.setattr(custom_message, "get_reader", lambda: reader)
+    reader.add_feed(feed_url)
+    feed: Feed = reader.get_feed(feed_url)
+    invalidate_feed_cache()
+
+    embed: CustomEmbed = get_embed(reader, feed)
+    embed.title = "{{entry_title}}"
+    embed.description = "{{entry_text}}"
+    embed.image_url = "{{image_1}}"
+    embed.footer_text = "{{entry_published}}\\n"
+    save_embed(reader, feed, embed)
+
+    replaced: CustomEmbed = replace_tags_in_embed(feed, make_entry(feed))
+    assert replaced.title == "Entry title"
+    assert replaced.description == "Content **bold**"
+    assert replaced.image_url == "https://example.com/summary.png"
+
+    # A literal \n is only replaced in text messages
+    assert replaced.footer_text == "2024-01-02 03:04:05+00:00\\n"
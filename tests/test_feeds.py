@@ -4,8 +4,9 @@ from pathlib import Path
 
 import pytest
 from reader import Feed, Reader, make_reader  # type: ignore
+from requests import ConnectionError as RequestsConnectionError
 
-from discord_rss_bot.feeds import send_to_discord
+from discord_rss_bot.feeds import send_to_discord, send_webhooks
 from discord_rss_bot.missing_tags import add_missing_tags
 
 
@@ -50,3 +51,36 @@ def test_send_to_discord() -> None:
 
         # Close the reader, so we can delete the directory.
         reader.close()
+
+
+class StubResponse:
+    def __init__(self, ok: bool) -> None:
+        self.ok: bool = ok
+
+
+class StubWebhook:
+    """A webhook that doesn't send anything, it only records that it was executed."""
+
+    def __init__(self, result: bool | Exception, sent: list[str], name: str) -> None:
+        self.result: bool | Exception = result
+        self.sent: list[str] = sent
+        self.name: str = name
+
+    def execute(self) -> StubResponse:
+        self.sent.append(self.name)
+        if isinstance(self.result, Exception):
+            raise self.result
+        return StubResponse(ok=self.result)
+
+
+def test_send_webhooks() -> None:
+    sent: list[str] = []
+    webhooks = [
+        ("first", StubWebhook(RequestsConnectionError("Connection refused"), sent, "first")),
+        ("second", StubWebhook(False, sent, "second")),
+        ("third", StubWebhook(True, sent, "third")),
+    ]
+
+    # Every entry is sent even if one fails, and only the entries that failed are returned.
+    assert send_webhooks(webhooks) == ["first", "second"]  # type: ignore
+    assert sent == ["first", "second", "third"]
@@ -1,3 +1,4 @@
+import logging
 import pathlib
 import tempfile
 from pathlib import Path
@@ -56,3 +57,10 @@ def test_get_webhook_for_entry() -> None:
 
         # Close the reader, so we can delete the directory.
         custom_reader.close()
+
+
+def test_logging() -> None:
+    """Our INFO messages should be shown even though nothing else configures logging."""
+    logger: logging.Logger = logging.getLogger("discord_rss_bot.missing_tags")
+    assert logger.isEnabledFor(logging.INFO)
+    assert logging.getLogger("discord_rss_bot").handlers
@@ -0,0 +1,58 @@
+import tempfile
+from pathlib import Path
+
+import pytest
+from fastapi import HTTPException
+from reader import Reader, make_reader
+
+from discord_rss_bot.webhook import add_webhook, list_webhooks, remove_webhook
+
+
+def get_reader() -> Reader:
+    tempdir: Path = Path(tempfile.mkdtemp())
+
+    reader_database: Path = tempdir / "test.sqlite"
+    reader: Reader = make_reader(url=str(reader_database))
+
+    return reader
+
+
+def test_list_webhooks() -> None:
+    reader: Reader = get_reader()
+    assert list_webhooks(reader) == []
+
+    # Adding and removing webhooks should update the cached list.
+    add_webhook(reader, "First", "https://example.com/first")
+    add_webhook(reader, "Second", "https://example.com/second")
+    assert list_webhooks(reader) == [
+        {"name": "First", "url": "https://example.com/first"},
+        {"name": "Second", "url": "https://example.com/second"},
+    ]
+
+    remove_webhook(reader, "https://example.com/first")
+    assert list_webhooks(reader) == [{"name": "Second", "url": "https://example.com/second"}]
+
+    # Changing the returned list should not change the cached one.
+    list_webhooks(reader)[0]["url"] = "https://example.com/changed"
+    assert list_webhooks(reader) == [{"name": "Second", "url": "https://example.com/second"}]
+
+    with pytest.raises(HTTPException):
+        add_webhook(reader, "Second", "https://example.com/second")
+
+    with pytest.raises(HTTPException):
+        remove_webhook(reader, "https://example.com/first")
+
+
+def test_remove_webhook_exact_url() -> None:
+    reader: Reader = get_reader()
+    add_webhook(reader, "Short", "https://discord.com/api/webhooks/1/abc")
+    add_webhook(reader, "Long", "https://discord.com/api/webhooks/1/abcdef")
+
+    # Only the webhook with the exact URL is removed, not the one whose URL is a prefix of it.
+    remove_webhook(reader, " https://discord.com/api/webhooks/1/abcdef ")
+    assert list_webhooks(reader) == [{"name": "Short", "url": "https://discord.com/api/webhooks/1/abc"}]
+
+    # A webhook isn't removed by a URL that only starts with its URL.
+    with pytest.raises(HTTPException):
+        remove_webhook(reader, "https://discord.com/api/webhooks/1/abcdef")
+    assert list_webhooks(reader) == [{"name": "Short", "url": "https://discord.com/api/webhooks/1/abc"}]